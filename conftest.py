@@ -1,6 +1,13 @@
+import importlib.util
+
 import pytest
 from hypothesis import settings
 
+# modules that import optional dependencies at module level, so that --doctest-modules can collect pyranges without them
+collect_ignore = []
+if importlib.util.find_spec("numba") is None:
+    collect_ignore.append("pyranges/methods/overlap_numba.py")
+
 
 @pytest.fixture(autouse=True)
 def set_max_console_width() -> None:
@@ -35,8 +35,6 @@ OVERLAP_FIRST, OVERLAP_CONTAINMENT, OVERLAP_ALL, OVERLAP_LAST = VALID_OVERLAP_OP
 
 BY_ENTRY_IN_KWARGS = "__by__"
 
-PRESERVE_INDEX_COLUMN = "__old_index__"
-
 
 CHROM_COL: Final = "Chromosome"
 START_COL = "Start"
@@ -126,6 +124,15 @@ SKIP_IF_EMPTY_ANY: Final = "any"
 SKIP_IF_EMPTY_BOTH: Final = "both"
 SKIP_IF_DF_EMPTY_OPTIONS = [False, SKIP_IF_EMPTY_ANY, SKIP_IF_EMPTY_BOTH, SKIP_IF_EMPTY_LEFT, SKIP_IF_EMPTY_RIGHT]
 SKIP_IF_DF_EMPTY_DEFAULT = "any"
+# bit 0: skip if the left df is empty, bit 1: skip if the right df is empty, bit 2: skip only if both are empty
+# other values (e.g. True, passed by count_overlaps) never skip, like False
+SKIP_IF_EMPTY_BITS: Final = {
+    False: 0b000,
+    SKIP_IF_EMPTY_LEFT: 0b001,
+    SKIP_IF_EMPTY_RIGHT: 0b010,
+    SKIP_IF_EMPTY_ANY: 0b011,
+    SKIP_IF_EMPTY_BOTH: 0b100,
+}
 
 
 class UnaryOperation[T: "RangeFrame"](Protocol):
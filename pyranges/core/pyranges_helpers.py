@@ -179,8 +179,10 @@ def arg_to_list(by: VALID_BY_OPTIONS) -> list[str]:
 
     If by is a string, it will be converted to a list.
     If by is None, an empty list will be returned.
-    If by is already a list, it will be returned as is.
+    If by is already a list, it will be returned as is (not copied), so the result must not be modified in place.
     """
+    if isinstance(by, list):
+        return by
     return [by] if isinstance(by, str) else ([*by] if by is not None else [])
 
 
@@ -111,6 +111,10 @@ class PyRanges(RangeFrame):
 
     copy : bool or None, default None
 
+    compact_coords : bool, default False
+        Store Start and End as int32 if they are integers within its range, halving their memory use.
+        Binary operations between PyRanges with different coordinate dtypes cast both to a common one first.
+
 
     See Also
     --------
@@ -146,6 +150,15 @@ class PyRanges(RangeFrame):
     PyRanges with 2 rows, 3 columns, and 1 index columns.
     Contains 2 chromosomes.
 
+    >>> pr.PyRanges(df, compact_coords=True)
+      index  |    Chromosome      Start      End
+      int64  |    object          int32    int32
+    -------  ---  ------------  -------  -------
+          0  |    chr1              100      150
+          1  |    chr2              200      201
+    PyRanges with 2 rows, 3 columns, and 1 index columns.
+    Contains 2 chromosomes.
+
     Or you can use a dictionary of iterables:
 
     >>> gr = pr.PyRanges({"Chromosome": [1, 1], "Strand": ["+", "-"], "Start": [1, 4], "End": [2, 27],
@@ -535,8 +548,8 @@ class PyRanges(RangeFrame):
             max_total_width=kwargs.get("max_total_width"),
         )
         str_repr = f"{str_repr}\n{self._chrom_and_strand_info()}."
-        if reasons := InvalidRangesReason.formatted_reasons_list(self):
-            str_repr = f"{str_repr}\nInvalid ranges:\n{reasons}"
+        if reasons := self.reasons_why_frame_is_invalid():
+            str_repr = f"{str_repr}\nInvalid ranges:\n{InvalidRangesReason.formatted_reasons_list(self, reasons)}"
         return str_repr
 
     def apply_single(
@@ -568,7 +581,7 @@ class PyRanges(RangeFrame):
             Columns - in addition to chromosome and strand - to group by.
 
         preserve_index: bool
-            Keep the old index. Only valid if the function preserves the index columns.
+            Keep the old index. Only valid if the function preserves the index of the rows it returns.
 
         kwargs : dict
             Arguments passed along to the function.
@@ -4846,7 +4859,7 @@ class PyRanges(RangeFrame):
 
         # intron start is exon end shifted
         fill_value = 0
-        introns[END_COL] = introns.groupby(transcript_id, group_keys=False, observed=True)[END_COL].shift(
+        introns[END_COL] = introns.groupby(transcript_id, group_keys=False, sort=False, observed=True)[END_COL].shift(
             fill_value=fill_value,
         )
 
@@ -4858,7 +4871,7 @@ class PyRanges(RangeFrame):
 
         # removing first line of each group
         if not include_external:
-            selector = selector & (introns.groupby(transcript_id).cumcount() != 0)
+            selector = selector & (introns.groupby(transcript_id, sort=False).cumcount() != 0)
         introns = introns.loc[selector].reset_index(drop=True)
 
         return mypy_ensure_pyranges(introns)
@@ -41,5 +41,6 @@ def version_info() -> None:
     update_version_info(version_info, "pybigwig")
     update_version_info(version_info, "hypothesis")
     update_version_info(version_info, "pyfaidx")
+    update_version_info(version_info, "numba")
 
     LOGGER.info(json.dumps(version_info, indent=4))
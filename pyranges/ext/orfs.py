@@ -113,7 +113,7 @@ def calculate_frame(p: "pr.PyRanges", transcript_id: str | list[str], frame_col:
     sorted_p[TEMP_LENGTH_COL] = sorted_p.lengths()
 
     # Creating a column saving the cumulative length for the intervals
-    sorted_p[TEMP_CUMSUM_COL] = sorted_p.groupby(transcript_id)[TEMP_LENGTH_COL].cumsum()
+    sorted_p[TEMP_CUMSUM_COL] = sorted_p.groupby(transcript_id, sort=False)[TEMP_LENGTH_COL].cumsum()
 
     # Creating a frame column
     sorted_p[FRAME_COL] = (sorted_p[TEMP_CUMSUM_COL] - sorted_p[TEMP_LENGTH_COL]) % 3
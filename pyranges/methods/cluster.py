@@ -22,8 +22,7 @@ def _cluster(
     df.insert(df.shape[1], cluster_column, ids)
 
     if count_column:
-        _count = df.groupby(cluster_column)["Cluster"].count()
-        _count.name = count_column
-        df = df.merge(_count, on=cluster_column)
+        # map the counts rather than merging them, since callers rely on the index being kept
+        df.insert(df.shape[1], count_column, df[cluster_column].map(df[cluster_column].value_counts()))
 
     return df
@@ -14,7 +14,8 @@ def _number_overlapping(df: pd.DataFrame, df2: pd.DataFrame, **kwargs) -> pd.Dat
             df = df.copy()
             df.insert(df.shape[1], column_name, 0)
             return df
-        return df2
+        # an empty slice of df rather than df2, so that the concatenated results keep the columns and dtypes of df
+        return df.iloc[:0].assign(**{column_name: 0})
 
     oncls = NCLS(df2.Start.to_numpy(), df2.End.to_numpy(), df2.index.to_numpy())
 
@@ -1,3 +1,4 @@
+import contextlib
 from typing import TYPE_CHECKING
 
 import numpy as np
@@ -17,6 +18,8 @@ from pyranges.core.names import (
 from pyranges.range_frame.range_frame import _mypy_ensure_rangeframe
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     import pyranges as pr
     from pyranges import RangeFrame
 
@@ -25,6 +28,7 @@ def _overlap_indices(
     df: "RangeFrame",
     df2: "RangeFrame",
     how: VALID_OVERLAP_TYPE = "first",
+    indexes: "np.ndarray | None" = None,
     **_,
 ) -> "pd.Series[int]":
     if df.empty or df2.empty:
@@ -32,7 +36,8 @@ def _overlap_indices(
 
     starts = df.Start.to_numpy()
     ends = df.End.to_numpy()
-    indexes = df.index.to_numpy()
+    if indexes is None:
+        indexes = df.index.to_numpy()
 
     it = NCLS(df2.Start.to_numpy(), df2.End.to_numpy(), df2.index.to_numpy())
 
@@ -81,6 +86,23 @@ def _overlap(
     return _result
 
 
+def _overlap_positions(
+    df: "RangeFrame",
+    df2: "RangeFrame",
+    *,
+    how: VALID_OVERLAP_TYPE = "all",
+    invert: bool = False,
+    **_,
+) -> "np.ndarray":
+    """Like _overlap, but return the row positions in df of the result instead of the rows themselves."""
+    all_positions = np.arange(len(df), dtype=np.int64)
+    positions = _overlap_indices(df, df2, how, indexes=all_positions).to_numpy()
+
+    if invert:
+        return all_positions[~np.isin(all_positions, positions)]
+    return positions
+
+
 def _count_overlaps(
     df: "RangeFrame",
     df2: "RangeFrame",
@@ -143,3 +165,126 @@ def _intersect(
     df.loc[:, END_COL] = new_ends
 
     return df
+
+
+# the numba kernel is compiled on first use, which takes seconds: only worth it for large inputs
+_MIN_ROWS_FOR_NUMBA_KERNEL = 1_000_000
+
+
+def _overlap_counts_by_group(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    codes: np.ndarray,
+    starts2: np.ndarray,
+    ends2: np.ndarray,
+    codes2: np.ndarray,
+) -> "np.ndarray":
+    """Count the intervals in the second set overlapping each interval in the first set, within groups.
+
+    Groups are given as integer codes shared by both sets; rows with a negative code are never counted.
+    With the starts and ends of the second set sorted independently per group, the number of intervals
+    overlapping [start, end) is the number of starts < end minus the number of ends <= start.
+
+    Integer coordinates are shifted per group (see _group_offset_span) and searched for all groups at once.
+    Other coordinates are searched group by group, in parallel by a compiled kernel if numba is installed and
+    the input is large enough to make up for compiling it.
+    """
+    n_groups = int(max(codes.max(initial=-1), codes2.max(initial=-1))) + 1
+    if span := _group_offset_span(starts, ends, starts2, ends2, n_groups=n_groups):
+        # the intervals of earlier groups add as many starts as ends to the two searches, and later groups none
+        in_group, in_group2 = codes >= 0, codes2 >= 0
+        offsets, offsets2 = codes[in_group] * span, codes2[in_group2] * span
+        shifted_starts2 = np.sort(starts2[in_group2].astype(np.int64) + offsets2)
+        shifted_ends2 = np.sort(ends2[in_group2].astype(np.int64) + offsets2)
+        counts = np.zeros(len(starts), dtype=np.int64)
+        counts[in_group] = np.searchsorted(
+            shifted_starts2,
+            ends[in_group].astype(np.int64) + offsets,
+            side="left",
+        ) - np.searchsorted(shifted_ends2, starts[in_group].astype(np.int64) + offsets, side="right")
+        return counts
+
+    kernel: "Callable | None" = None
+    numeric = all(a.dtype.kind in "iuf" for a in (starts, ends, starts2, ends2))
+    if numeric and len(starts) + len(starts2) >= _MIN_ROWS_FOR_NUMBA_KERNEL:
+        with contextlib.suppress(ImportError):
+            from pyranges.methods.overlap_numba import _overlap_counts_in_sorted_groups as kernel
+
+    order = np.argsort(codes, kind="stable")
+    order_starts2 = np.lexsort((starts2, codes2))
+    sorted_starts2 = starts2[order_starts2]
+    sorted_ends2 = ends2[np.lexsort((ends2, codes2))]
+
+    group_ids = np.arange(n_groups + 1)
+    bounds = np.searchsorted(codes[order], group_ids)
+    bounds2 = np.searchsorted(codes2[order_starts2], group_ids)
+
+    if kernel is not None:
+        return kernel(starts, ends, order, bounds, sorted_starts2, sorted_ends2, bounds2)
+
+    counts = np.zeros(len(starts), dtype=np.int64)
+    for lo, hi, lo2, hi2 in zip(bounds[:-1], bounds[1:], bounds2[:-1], bounds2[1:], strict=True):
+        if lo == hi or lo2 == hi2:
+            continue
+        rows = order[lo:hi]
+        n_starts_before_end = np.searchsorted(sorted_starts2[lo2:hi2], ends[rows], side="left")
+        n_ends_before_start = np.searchsorted(sorted_ends2[lo2:hi2], starts[rows], side="right")
+        counts[rows] = n_starts_before_end - n_ends_before_start
+
+    return counts
+
+
+def _group_offset_span(*coordinates: np.ndarray, n_groups: int) -> int | None:
+    """Return the shift between consecutive groups that keeps the (non-negative) intervals of groups apart.
+
+    With the coordinates of group g shifted by g times the span, all intervals of group g lie in
+    [g * span, (g + 1) * span). Returns None if the coordinates are not integers, or if the shifted
+    coordinates would not fit in int64.
+    """
+    if any(a.dtype.kind not in "iu" for a in coordinates):
+        return None
+    span = int(max(a.max(initial=0) for a in coordinates)) + 1
+    if n_groups * span > np.iinfo(np.int64).max:
+        return None
+    return span
+
+
+def _containment_counts_by_group(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    codes: np.ndarray,
+    starts2: np.ndarray,
+    ends2: np.ndarray,
+    codes2: np.ndarray,
+) -> np.ndarray | None:
+    """Count the intervals in the second set containing each interval in the first set, within groups.
+
+    A single NCLS is built for all groups, with the coordinates of each group shifted (see _group_offset_span),
+    so that intervals of different groups can never contain each other. Returns None if the coordinates cannot
+    be shifted.
+    """
+    n_groups = int(max(codes.max(initial=-1), codes2.max(initial=-1))) + 1
+    span = _group_offset_span(starts, ends, starts2, ends2, n_groups=n_groups)
+    if span is None:
+        return None
+
+    counts = np.zeros(len(starts), dtype=np.int64)
+    in_group, in_group2 = codes >= 0, codes2 >= 0
+    if not in_group.any() or not in_group2.any():
+        return counts
+
+    offsets2 = codes2[in_group2] * span
+    it = NCLS(
+        starts2[in_group2].astype(np.int64) + offsets2,
+        ends2[in_group2].astype(np.int64) + offsets2,
+        np.flatnonzero(in_group2).astype(np.int64),
+    )
+
+    offsets = codes[in_group] * span
+    positions, _ = it.all_containments_both(
+        starts[in_group].astype(np.int64) + offsets,
+        ends[in_group].astype(np.int64) + offsets,
+        np.flatnonzero(in_group).astype(np.int64),
+    )
+    np.add.at(counts, np.asarray(positions, dtype=np.int64), 1)
+    return counts
@@ -0,0 +1,33 @@
+import numpy as np
+from numba import njit, prange  # type: ignore[import]
+
+
+@njit(parallel=True, cache=True)
+def _overlap_counts_in_sorted_groups(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    order: np.ndarray,
+    bounds: np.ndarray,
+    sorted_starts2: np.ndarray,
+    sorted_ends2: np.ndarray,
+    bounds2: np.ndarray,
+) -> np.ndarray:
+    """Count overlaps like _overlap_counts_by_group, with the groups processed in parallel.
+
+    Rows order[bounds[g]:bounds[g + 1]] of the first set are in group g, as are the entries
+    bounds2[g]:bounds2[g + 1] of the starts and ends of the second set, sorted within each group.
+    """
+    counts = np.zeros(len(starts), dtype=np.int64)
+    for g in prange(len(bounds) - 1):
+        lo, hi = bounds[g], bounds[g + 1]
+        lo2, hi2 = bounds2[g], bounds2[g + 1]
+        if lo == hi or lo2 == hi2:
+            continue
+        group_starts2 = sorted_starts2[lo2:hi2]
+        group_ends2 = sorted_ends2[lo2:hi2]
+        for i in range(lo, hi):
+            row = order[i]
+            n_starts_before_end = np.searchsorted(group_starts2, ends[row], side="left")
+            n_ends_before_start = np.searchsorted(group_ends2, starts[row], side="right")
+            counts[row] = n_starts_before_end - n_ends_before_start
+    return counts
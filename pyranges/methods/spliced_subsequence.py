@@ -47,7 +47,7 @@ def _spliced_subseq(
     df.insert(df.shape[1], TEMP_LENGTH_COL, df.End - df.Start)
     df.insert(df.shape[1], TEMP_INDEX_COL, df.index)
 
-    g = df.groupby(by, dropna=False)
+    g = df.groupby(by, dropna=False, sort=False)
     df.insert(df.shape[1], TEMP_CUMSUM_COL, g[TEMP_LENGTH_COL].cumsum())
 
     end = df[TEMP_CUMSUM_COL].max() if end is None else end
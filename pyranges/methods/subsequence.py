@@ -58,12 +58,16 @@ def _subseq(
 
     if by_argument_given:
         j = (
-            df.groupby(by, dropna=False)[[START_COL, END_COL, TEMP_INDEX_COL, *by]]
+            df.groupby(by, dropna=False, sort=False, observed=True)[[START_COL, END_COL, TEMP_INDEX_COL, *by]]
             .agg(agg_dict)
             .set_index(TEMP_INDEX_COL)
         )
     else:
-        j = df.groupby(by, dropna=False)[[START_COL, END_COL, TEMP_INDEX_COL]].agg(agg_dict).set_index(TEMP_INDEX_COL)
+        j = (
+            df.groupby(by, dropna=False, sort=False, observed=True)[[START_COL, END_COL, TEMP_INDEX_COL]]
+            .agg(agg_dict)
+            .set_index(TEMP_INDEX_COL)
+        )
         j.insert(0, TEMP_INDEX_COL, j.index)
         j.index.name = None
 
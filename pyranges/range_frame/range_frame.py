@@ -1,19 +1,25 @@
+import functools
 import inspect
-from collections.abc import Callable, Iterable
+import itertools
+from collections.abc import Callable, Sized
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 from pyranges.core.names import (
     BY_ENTRY_IN_KWARGS,
-    PRESERVE_INDEX_COLUMN,
+    END_COL,
+    OVERLAP_ALL,
+    OVERLAP_CONTAINMENT,
+    OVERLAP_FIRST,
+    OVERLAP_LAST,
     RANGE_COLS,
     SKIP_IF_DF_EMPTY_DEFAULT,
     SKIP_IF_DF_EMPTY_TYPE,
-    SKIP_IF_EMPTY_ANY,
-    SKIP_IF_EMPTY_BOTH,
-    SKIP_IF_EMPTY_LEFT,
+    SKIP_IF_EMPTY_BITS,
     SKIP_IF_EMPTY_RIGHT,
+    START_COL,
     VALID_BY_TYPES,
     VALID_OVERLAP_TYPE,
     BinaryOperation,
@@ -23,16 +29,27 @@ from pyranges.core.pyranges_helpers import arg_to_list
 from pyranges.core.tostring import tostring
 from pyranges.range_frame.range_frame_validator import InvalidRangesReason
 
+_RANGE_COLS_SET = frozenset(RANGE_COLS)
 
-def should_skip_operation(df: pd.DataFrame, *, df2: pd.DataFrame, skip_if_empty: SKIP_IF_DF_EMPTY_TYPE) -> bool:
-    """Whether to skip operation because one or more dfs are empty."""
-    if df.empty and df2.empty:
-        return skip_if_empty in {SKIP_IF_EMPTY_BOTH, SKIP_IF_EMPTY_ANY, SKIP_IF_EMPTY_LEFT, SKIP_IF_EMPTY_RIGHT}
-    if df.empty:
-        return skip_if_empty in {SKIP_IF_EMPTY_LEFT, SKIP_IF_EMPTY_ANY}
-    if df2.empty:
-        return skip_if_empty in {SKIP_IF_EMPTY_RIGHT, SKIP_IF_EMPTY_ANY}
-    return False
+# overlap types for which the result of _overlap only depends on the number of overlaps (or containments) of each
+# interval
+_VECTORIZED_OVERLAP_TYPES = {OVERLAP_FIRST, OVERLAP_ALL, OVERLAP_LAST, OVERLAP_CONTAINMENT}
+
+
+def should_skip_operation(df: Sized, *, df2: Sized, skip_if_empty: SKIP_IF_DF_EMPTY_TYPE) -> bool:
+    """Whether to skip operation because one or more dfs are empty.
+
+    Only the lengths are inspected, so the row indices of a group can be passed instead of the group itself.
+    """
+    return _should_skip_operation_bits(df, df2=df2, skip_bits=SKIP_IF_EMPTY_BITS.get(skip_if_empty, 0))
+
+
+def _should_skip_operation_bits(df: Sized, *, df2: Sized, skip_bits: int) -> bool:
+    """Like should_skip_operation, with skip_if_empty already converted with SKIP_IF_EMPTY_BITS."""
+    empty_mask = (len(df) == 0) | ((len(df2) == 0) << 1)
+    if empty_mask == 0b11:  # noqa: PLR2004
+        return skip_bits != 0
+    return bool(empty_mask & skip_bits)
 
 
 class RangeFrame(pd.DataFrame):
@@ -53,11 +70,21 @@ class RangeFrame(pd.DataFrame):
         if not kwargs:
             return super().__new__(cls)
 
-        df = pd.DataFrame(kwargs.get("data") or (args[0]))
+        data = kwargs.get("data")
+        if data is None:
+            data = args[0]
+
+        # inspect the columns without constructing a DataFrame when possible, since __init__ will construct one
+        if isinstance(data, pd.DataFrame):
+            columns = data.columns
+        elif isinstance(data, dict):
+            columns = data.keys()
+        else:
+            columns = pd.DataFrame(data).columns
 
-        missing_any_required_columns = not set(RANGE_COLS).issubset(df.columns)
+        missing_any_required_columns = not _RANGE_COLS_SET.issubset(columns)
         if missing_any_required_columns:
-            return df
+            return pd.DataFrame(data)
 
         return super().__new__(cls)
 
@@ -65,14 +92,39 @@ class RangeFrame(pd.DataFrame):
     def _constructor(self) -> type:
         return RangeFrame
 
+    def _constructor_from_mgr(self, mgr, axes) -> pd.DataFrame:
+        # results of pandas methods (copy, drop, reindex, ...) are wrapped here: for a RangeFrame, check the columns
+        # directly instead of going through __init__, and return a DataFrame when the range columns are gone
+        if type(self) is not RangeFrame:
+            return super()._constructor_from_mgr(mgr, axes)  # type: ignore[misc]
+        if not _RANGE_COLS_SET.issubset(axes[0]):
+            return pd.DataFrame._from_mgr(mgr, axes=axes)  # type: ignore[attr-defined]  # noqa: SLF001
+        return RangeFrame._from_mgr(mgr, axes=axes)  # type: ignore[attr-defined]
+
+    @classmethod
+    def _from_validated(cls, df: pd.DataFrame) -> "RangeFrame":
+        """Wrap a DataFrame known to contain the range columns, skipping __init__ and its validation.
+
+        Use _mypy_ensure_rangeframe for frames that might lack the range columns. Always call it as
+        RangeFrame._from_validated: subclasses set attributes in __init__.
+        """
+        return cls._from_mgr(df._mgr.copy(deep=False), axes=df._mgr.axes)  # type: ignore[attr-defined]  # noqa: SLF001
+
     def __init__(self, *args, **kwargs) -> None:
+        # remove compact_coords from kwargs since the DataFrame constructor does not expect it
+        compact_coords = kwargs.pop("compact_coords", False)
         super().__init__(*args, **kwargs)
 
-        missing_columns = [c for c in RANGE_COLS if c not in self.columns]
-        if missing_columns:
+        columns = self.columns
+        if not _RANGE_COLS_SET.issubset(columns):
+            missing_columns = [c for c in RANGE_COLS if c not in columns]
             msg = f"Missing required columns: {missing_columns}"
             raise ValueError(msg)
 
+        if compact_coords and _coords_fit_in_int32(self):
+            for col in RANGE_COLS:
+                self[col] = self[col].astype(np.int32)
+
     def __str__(
         self,
         **kwargs: int | None,
@@ -83,8 +135,8 @@ class RangeFrame(pd.DataFrame):
             max_col_width=kwargs.get("max_col_width"),
             max_total_width=kwargs.get("max_total_width"),
         )
-        if reasons := InvalidRangesReason.formatted_reasons_list(self):
-            return f"{str_repr}\nInvalid ranges:\n{reasons}"
+        if reasons := self.reasons_why_frame_is_invalid():
+            return f"{str_repr}\nInvalid ranges:\n{InvalidRangesReason.formatted_reasons_list(self, reasons)}"
         return str_repr
 
     def __repr__(self, max_col_width: int | None = None, max_total_width: int | None = None) -> str:
@@ -195,7 +247,7 @@ class RangeFrame(pd.DataFrame):
             Group by these columns.
 
         preserve_index: bool
-            Preserve the original index. Only valid if the function returns the index cols.
+            Preserve the original index. Only valid if the function keeps the index of the rows it returns.
 
         kwargs: dict
             Passed to function.
@@ -207,21 +259,26 @@ class RangeFrame(pd.DataFrame):
             return _mypy_ensure_rangeframe(function(self, **kwargs))
         by = arg_to_list(by)
 
-        f = _with_group_keys_to_kwargs(by)(function)
+        # sort the rows by group once and pass contiguous slices to function, rather than using groupby.apply
+        (codes,) = _group_codes(self, by=by)
+        order, bounds = _group_positions(codes, n_groups=codes.max(initial=-1) + 1)
+        sorted_self = self.take(order)
+        key_values = [sorted_self[col].to_numpy() for col in by]
+
+        results = []
+        for start, end in itertools.pairwise(bounds):
+            group_keys = {col: col_values[start] for col, col_values in zip(by, key_values, strict=True)}
+            results.append(function(sorted_self.iloc[start:end], by=by, **(kwargs | {BY_ENTRY_IN_KWARGS: group_keys})))
+        # the slices keep the original index, so no bookkeeping is needed to preserve it
+        if results:
+            result = pd.concat(results, ignore_index=not preserve_index)
+        else:
+            # no groups: keep the columns and dtypes of self, as the functions do for empty input
+            result = self.iloc[:0] if preserve_index else self.iloc[:0].reset_index(drop=True)
+
         if not preserve_index:
-            return _mypy_ensure_rangeframe(self.groupby(by).apply(f, by=by, **kwargs).reset_index(drop=True))
+            return _mypy_ensure_rangeframe(result)
 
-        result = (
-            self.assign(**{PRESERVE_INDEX_COLUMN: lambda df: df.index})
-            .groupby(by)
-            .apply(
-                f,
-                by=by,
-                **kwargs,
-            )
-            .reset_index(drop=True)
-        )
-        result = result.set_index(PRESERVE_INDEX_COLUMN)
         if isinstance(self.index, pd.MultiIndex):
             result.index.names = self.index.names
         else:
@@ -273,55 +330,127 @@ class RangeFrame(pd.DataFrame):
 
         """
         assert_valid_ranges(function, self, other)
+        self, other = _with_common_coordinate_dtype(self, other)
         if by is None:
             return _mypy_ensure_rangeframe(function(self, df2=other, **kwargs))
 
         by = arg_to_list(by)
-        results = []
-        empty = RangeFrame(columns=other.columns)
-        others = dict(list(other.groupby(by)))
 
-        for key, _df in self.groupby(by):
-            odf = others.get(key, empty)
+        from pyranges.methods.overlap import _overlap, _overlap_positions
+
+        skip_bits = SKIP_IF_EMPTY_BITS.get(skip_if_empty, 0)
+        if function is _overlap and kwargs.get("how", OVERLAP_ALL) in _VECTORIZED_OVERLAP_TYPES:
+            vectorized_result = self._apply_pair_overlap_vectorized(
+                other,
+                by=by,
+                how=kwargs.get("how", OVERLAP_ALL),
+                invert=kwargs.get("invert", False),
+                skip_bits=skip_bits,
+            )
+            if vectorized_result is not None:
+                return vectorized_result
+
+        # functions that only select rows of self are replaced by variants returning row positions within the
+        # group, so the output is a single take from self rather than a concat of the per-group results
+        returns_positions = function is _overlap
+        group_function: Callable = _overlap_positions if returns_positions else function
+
+        # number the groups of both frames from the same keys, and work on row positions sorted by group, so
+        # that skipped groups are never sliced out of the frames
+        codes, other_codes = _group_codes(self, other, by=by)
+        n_groups = max(codes.max(initial=-1), other_codes.max(initial=-1)) + 1
+        order, bounds = _group_positions(codes, n_groups=n_groups)
+        other_order, other_bounds = _group_positions(other_codes, n_groups=n_groups)
+        key_values = [self[col].to_numpy() for col in by]
+
+        results = []
+        for lo, hi, other_lo, other_hi in zip(
+            bounds[:-1],
+            bounds[1:],
+            other_bounds[:-1],
+            other_bounds[1:],
+            strict=True,
+        ):
+            if lo == hi:  # group only in other
+                continue
+            indices, odf_indices = order[lo:hi], other_order[other_lo:other_hi]
 
-            if should_skip_operation(_df, df2=odf, skip_if_empty=skip_if_empty):
+            if _should_skip_operation_bits(indices, df2=odf_indices, skip_bits=skip_bits):
                 continue
-            results.append(
-                function(
-                    _mypy_ensure_rangeframe(_df),
-                    df2=_mypy_ensure_rangeframe(odf),
-                    **(
-                        kwargs
-                        | {BY_ENTRY_IN_KWARGS: dict(zip(by, [key] if not isinstance(key, tuple) else key, strict=True))}
-                    ),
-                ),
+
+            odf = _empty_range_frame(tuple(other.columns)) if len(odf_indices) == 0 else other.take(odf_indices)
+
+            group_keys = {col: col_values[indices[0]] for col, col_values in zip(by, key_values, strict=True)}
+            result = group_function(
+                RangeFrame._from_validated(self.take(indices)),
+                df2=RangeFrame._from_validated(odf),
+                **(kwargs | {BY_ENTRY_IN_KWARGS: group_keys}),
             )
+            results.append(indices[result] if returns_positions else result)
 
         if not results:
             return _mypy_ensure_rangeframe(RangeFrame(columns=self.columns))
+        if returns_positions:
+            return RangeFrame._from_validated(self.take(np.concatenate(results)))
         return _mypy_ensure_rangeframe(pd.concat(results))
 
+    def _apply_pair_overlap_vectorized(
+        self,
+        other: "RangeFrame",
+        by: list[str],
+        how: VALID_OVERLAP_TYPE,
+        *,
+        invert: bool = False,
+        skip_bits: int = 0,
+    ) -> "RangeFrame | None":
+        """Find the intervals in self overlapping other within groups, for all groups at once.
+
+        Equivalent to apply_pair with _overlap for the overlap types in _VECTORIZED_OVERLAP_TYPES, but without
+        calling a function per group: "first" and "last" keep the intervals with at least one overlap, while "all"
+        and "containment" repeat each of them once per overlapping (or containing) interval. Rows are returned
+        ordered by group, like apply_pair does, and groups skipped by skip_bits (see SKIP_IF_EMPTY_BITS) are left
+        out. Returns None if the containments cannot be counted in one pass.
+        """
+        from pyranges.methods.overlap import _containment_counts_by_group, _overlap_counts_by_group
+
+        codes, codes2 = _group_codes(self, other, by=by)
+        count_function = _containment_counts_by_group if how == OVERLAP_CONTAINMENT else _overlap_counts_by_group
+        counts = count_function(
+            self[START_COL].to_numpy(),
+            self[END_COL].to_numpy(),
+            codes,
+            other[START_COL].to_numpy(),
+            other[END_COL].to_numpy(),
+            codes2,
+        )
+        if counts is None:
+            return None
+
+        keep = (counts == 0) if invert else (counts > 0)
+        if skip_bits & SKIP_IF_EMPTY_BITS[SKIP_IF_EMPTY_RIGHT]:
+            # the groups of rows in self are never empty on the left, so only groups missing from other are skipped
+            in_other = np.bincount(codes2[codes2 >= 0], minlength=codes.max(initial=0) + 1) > 0
+            keep &= in_other[np.maximum(codes, 0)]
+        order = np.argsort(codes, kind="stable")
+        order = order[keep[order] & (codes[order] >= 0)]
+        if how in (OVERLAP_ALL, OVERLAP_CONTAINMENT) and not invert:
+            order = np.repeat(order, counts[order])
+        return RangeFrame._from_validated(self.take(order))
+
     def sort_by_position(self) -> "RangeFrame":
         """Sort by Start and End columns."""
-        return _mypy_ensure_rangeframe(self.sort_values(RANGE_COLS))
+        return RangeFrame._from_validated(self.sort_values(RANGE_COLS))
 
     def reasons_why_frame_is_invalid(self) -> list[InvalidRangesReason] | None:  # noqa: D102
         __doc__ = InvalidRangesReason.is_invalid_ranges_reasons.__doc__  # noqa: A001, F841
 
+        if len(self) == 0:
+            return None
         return InvalidRangesReason.is_invalid_ranges_reasons(self)
 
-    def copy(self, *args, **kwargs) -> "RangeFrame":  # noqa: D102
-        return _mypy_ensure_rangeframe(super().copy(*args, **kwargs))
-
-    def drop(self, *args, **kwargs) -> "RangeFrame | None":  # type: ignore[override]  # noqa: D102
-        return self.__class__(super().drop(*args, **kwargs))
-
     def drop_and_return[T: "RangeFrame"](self: T, *args: Any, **kwargs: Any) -> T:  # noqa: PYI019, D102
         kwargs["inplace"] = False
-        return self.__class__(super().drop(*args, **kwargs))
-
-    def reindex(self, *args, **kwargs) -> "RangeFrame":  # noqa: D102
-        return self.__class__(super().reindex(*args, **kwargs))
+        return super().drop(*args, **kwargs)  # type: ignore[return-value]
 
 
 def _mypy_ensure_rangeframe(r: pd.DataFrame) -> "RangeFrame":
@@ -332,23 +461,76 @@ def _mypy_ensure_rangeframe(r: pd.DataFrame) -> "RangeFrame":
     return result
 
 
+def _coords_fit_in_int32(df: pd.DataFrame) -> bool:
+    """Return True if Start and End are integers that can be stored as int32."""
+    starts, ends = df[START_COL].to_numpy(), df[END_COL].to_numpy()
+    if starts.dtype.kind not in "iu" or ends.dtype.kind not in "iu":
+        return False
+    int32_info = np.iinfo(np.int32)
+    return (
+        min(starts.min(initial=0), ends.min(initial=0)) >= int32_info.min
+        and max(starts.max(initial=0), ends.max(initial=0)) <= int32_info.max
+    )
+
+
+def _with_common_coordinate_dtype[T: "RangeFrame", U: "RangeFrame"](df: T, df2: U) -> tuple[T, U]:
+    """Cast Start and End of both frames to a common dtype if they differ, e.g. when only one has compact_coords.
+
+    NCLS, used by most binary operations, requires the coordinates of both frames to have the same dtype.
+    """
+    dtypes = {frame[col].dtype for frame in (df, df2) for col in RANGE_COLS}
+    if len(dtypes) == 1 or not all(isinstance(dtype, np.dtype) for dtype in dtypes):
+        return df, df2
+
+    dtype = np.result_type(*dtypes)
+
+    def _cast[V: "RangeFrame"](frame: V) -> V:
+        if all(frame[col].dtype == dtype for col in RANGE_COLS):
+            return frame
+        return frame.astype(dict.fromkeys(RANGE_COLS, dtype))  # type: ignore[return-value]
+
+    return _cast(df), _cast(df2)
+
+
+def _group_codes(*dfs: pd.DataFrame, by: list[str]) -> list[np.ndarray]:
+    """Return integer group codes for the rows of each frame, numbered from the same sorted group keys.
+
+    Rows with missing values in the by columns get code -1, since groupby drops them.
+    """
+    keys = pd.DataFrame({col: pd.concat([df[col] for df in dfs], ignore_index=True) for col in by})
+    codes = keys.groupby(by, sort=True, observed=True, dropna=True).ngroup().to_numpy(dtype=np.int64, na_value=-1)
+    return np.split(codes, np.cumsum([len(df) for df in dfs[:-1]]))
+
+
+def _group_positions(codes: np.ndarray, n_groups: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return the row positions sorted by group code, and the bounds of each group within them.
+
+    The rows of group g are order[bounds[g]:bounds[g + 1]], in their original order. Rows with code -1 come
+    before bounds[0], so they are in no group.
+    """
+    order = np.argsort(codes, kind="stable")
+    return order, np.searchsorted(codes[order], np.arange(n_groups + 1))
+
+
 def assert_valid_ranges(function: Callable, *args: "RangeFrame") -> None:
     """Raise ValueError because function is called on invalid ranges."""
-    if any(r.reasons_why_frame_is_invalid() for r in args):
-        is_not_lambda = function.__name__ != "<lambda>"
-        function_repr = function.__name__ if is_not_lambda else inspect.getsource(function).strip()
-        msg = f"Cannot perform function on invalid ranges (function was {function_repr})."
-        raise ValueError(msg)
+    # frames passed more than once (e.g. self.apply_pair(self, ...)) are validated once
+    for r in {id(r): r for r in args}.values():
+        if r.reasons_why_frame_is_invalid():
+            msg = f"Cannot perform function on invalid ranges (function was {_function_repr(function)})."
+            raise ValueError(msg)
+
 
+@functools.lru_cache(maxsize=32)
+def _empty_range_frame(columns: tuple) -> RangeFrame:
+    """Return an empty RangeFrame with the given columns, shared between calls.
 
-def _with_group_keys_to_kwargs(by: list[str]) -> Callable:
-    def decorator(func) -> Callable:
-        def wrapper(group, **kwargs) -> Any:
-            # Extract the group keys and add them to kwargs
-            names = group.name if isinstance(group.name, Iterable) and not isinstance(group.name, str) else [group.name]
-            kwargs[BY_ENTRY_IN_KWARGS] = dict(zip(by, names, strict=True))
-            return func(group, **kwargs)
+    It must not be modified: apply_pair only passes shallow copies of it (see RangeFrame._from_validated).
+    """
+    return RangeFrame._from_validated(pd.DataFrame(columns=list(columns)))  # noqa: SLF001
 
-        return wrapper
 
-    return decorator
+@functools.lru_cache(maxsize=32)
+def _function_repr(function: Callable) -> str:
+    is_not_lambda = function.__name__ != "<lambda>"
+    return function.__name__ if is_not_lambda else inspect.getsource(function).strip()
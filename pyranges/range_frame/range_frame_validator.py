@@ -49,11 +49,14 @@ class InvalidRangesReason:
         return {"reason": self.reason, "invalid_part": self.invalid_part}
 
     @staticmethod
-    def formatted_reasons_list(ranges: "RangeFrame") -> str:
-        """Return a formatted list of reasons why the range is invalid."""
+    def formatted_reasons_list(ranges: "RangeFrame", reasons: list["InvalidRangesReason"] | None = None) -> str:
+        """Return a formatted list of reasons why the range is invalid.
+
+        The reasons are computed from ranges unless already given.
+        """
         import textwrap
 
-        if reasons := InvalidRangesReason.is_invalid_ranges_reasons(ranges):
+        if reasons := reasons or InvalidRangesReason.is_invalid_ranges_reasons(ranges):
             return textwrap.indent("\n".join([str(r) for r in reasons]), prefix="  * ")
         return ""
 
@@ -128,6 +131,12 @@ class InvalidRangesReason:
         <BLANKLINE>
 
         """
+        starts, ends = df[START_COL].to_numpy(), df[END_COL].to_numpy()
+        # fast path for the common case where all ranges are valid: two comparisons on plain numeric arrays
+        # (comparisons with nan are False, and ends are > 0 whenever starts are >= 0 and < ends)
+        if starts.dtype.kind in "iuf" and ends.dtype.kind in "iuf" and (starts < ends).all() and (starts >= 0).all():
+            return None
+
         invalid_ranges_reasons: list["InvalidRangesReason"] = [
             invalid_ranges_reason
             for invalid_ranges_reason_class in sorted(InvalidRangesReason.__subclasses__(), key=lambda x: x.__name__)
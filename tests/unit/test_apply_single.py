@@ -0,0 +1,23 @@
+import pytest
+
+import pyranges as pr
+
+
+@pytest.fixture()
+def empty() -> pr.PyRanges:
+    return pr.PyRanges({"Chromosome": ["chr1"], "Start": [1], "End": [2], "Strand": ["+"]}).iloc[:0]
+
+
+@pytest.mark.parametrize(
+    "method",
+    [
+        lambda gr: gr.merge_overlaps(),
+        lambda gr: gr.max_disjoint(),
+        lambda gr: gr.extend(1),
+    ],
+)
+def test_empty_input_keeps_dtypes(empty, method) -> None:
+    res = method(empty)
+    assert len(res) == 0
+    assert res["Start"].dtype == "int64"
+    assert res["End"].dtype == "int64"
@@ -0,0 +1,32 @@
+import pytest
+
+import pyranges as pr
+
+
+@pytest.fixture()
+def gr() -> pr.PyRanges:
+    return pr.PyRanges(
+        {
+            "Chromosome": ["c1"] * 4,
+            "Start": [30, 1, 10, 2],
+            "End": [40, 5, 12, 6],
+            "Name": list("wxyz"),
+            "Gene": list("abab"),
+        },
+    )
+
+
+def test_cluster_count_column_keeps_index(gr) -> None:
+    res = gr.cluster(count_column="C")
+    assert res.index.tolist() == [0, 1, 2, 3]
+    assert res["Name"].tolist() == list("wxyz")
+    assert res["Cluster"].tolist() == [0, 1, 2, 1]
+    assert res["C"].tolist() == [1, 2, 1, 2]
+
+
+def test_cluster_match_by_count_column_keeps_index(gr) -> None:
+    res = gr.cluster(match_by="Gene", count_column="C")
+    assert res.index.tolist() == [0, 1, 2, 3]
+    assert res["Name"].tolist() == list("wxyz")
+    assert res["Cluster"].tolist() == [0, 1, 2, 1]
+    assert res["C"].tolist() == [1, 2, 1, 2]
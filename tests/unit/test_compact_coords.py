@@ -0,0 +1,30 @@
+import pandas as pd
+import pytest
+
+import pyranges as pr
+
+a = {"Chromosome": ["chr1", "chr1", "chr2"], "Start": [1, 10, 5], "End": [8, 20, 9], "Strand": ["+", "-", "+"]}
+b = {"Chromosome": ["chr1", "chr1", "chr2"], "Start": [3, 30, 0], "End": [12, 40, 2], "Strand": ["+", "-", "-"]}
+
+
+def test_compact_coords_downcasts() -> None:
+    gr = pr.PyRanges(a, compact_coords=True)
+    assert gr["Start"].dtype == "int32"
+    assert gr["End"].dtype == "int32"
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        lambda x, y: x.count_overlaps(y),
+        lambda x, y: x.join_ranges(y),
+        lambda x, y: x.nearest(y),
+        lambda x, y: x.intersect(y),
+        lambda x, y: x.subtract_ranges(y),
+    ],
+)
+@pytest.mark.parametrize(("compact_self", "compact_other"), [(True, False), (False, True)])
+def test_mixed_coordinate_dtypes(operation, compact_self, compact_other) -> None:
+    expected = operation(pr.PyRanges(a), pr.PyRanges(b))
+    res = operation(pr.PyRanges(a, compact_coords=compact_self), pr.PyRanges(b, compact_coords=compact_other))
+    pd.testing.assert_frame_equal(pd.DataFrame(res), pd.DataFrame(expected), check_dtype=False)
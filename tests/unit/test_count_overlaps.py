@@ -1,3 +1,5 @@
+import pytest
+
 import pyranges as pr
 from tests.helpers import assert_df_equal
 
@@ -59,3 +61,16 @@ chr1 30 40  - 0 0 1""",
 #     res.print(merge_position=True)
 
 #     assert_df_equal(res.df, expected_result.df)
+
+
+@pytest.mark.parametrize("calculate_coverage", [False, True])
+def test_keep_nonoverlapping_false(calculate_coverage) -> None:
+    gr = pr.PyRanges({"Chromosome": ["chr1", "chr1", "chr3"], "Start": [0, 20, 40], "End": [10, 30, 50]})
+    other = pr.PyRanges({"Chromosome": ["chr1", "chr2"], "Start": [5, 0], "End": [25, 5]})
+
+    res = gr.count_overlaps(other, keep_nonoverlapping=False, calculate_coverage=calculate_coverage)
+
+    assert res["NumberOverlaps"].tolist()[:2] == [1, 1]
+    assert res["NumberOverlaps"].isna().tolist() == [False, False, True]
+    if calculate_coverage:
+        assert res["CoverageOverlaps"].tolist()[:2] == [0.5, 0.5]
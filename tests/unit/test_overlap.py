@@ -0,0 +1,61 @@
+import sys
+
+import pandas as pd
+import pytest
+
+import pyranges as pr
+from pyranges.methods.overlap import _overlap
+
+
+def _overlap_per_group(df, *, df2, **kwargs):
+    return _overlap(df, df2=df2, **kwargs)
+
+
+@pytest.fixture()
+def r() -> pr.RangeFrame:
+    return pr.RangeFrame(
+        {
+            "Start": [1, 1, 2, 2, 10, 0, 7],
+            "End": [3, 3, 5, 4, 12, 1, 9],
+            "Id": ["a", "b", "a", "d", "d", "c", None],
+        },
+    )
+
+
+@pytest.fixture()
+def r2() -> pr.RangeFrame:
+    return pr.RangeFrame({"Start": [0, 2, 11, 3, 7], "End": [1, 20, 15, 4, 8], "Id": ["a", "d", "d", "a", None]})
+
+
+@pytest.mark.parametrize("how", ["first", "all", "last"])
+@pytest.mark.parametrize("invert", [False, True])
+@pytest.mark.parametrize("skip_if_empty", [False, "left", "right", "any", "both"])
+def test_vectorized_overlap_same_as_per_group(r, r2, how, invert, skip_if_empty) -> None:
+    res = r.apply_pair(r2, _overlap, by="Id", how=how, invert=invert, skip_if_empty=skip_if_empty)
+    expected = r.apply_pair(r2, _overlap_per_group, by="Id", how=how, invert=invert, skip_if_empty=skip_if_empty)
+    pd.testing.assert_frame_equal(pd.DataFrame(res), pd.DataFrame(expected))
+
+
+@pytest.mark.parametrize("invert", [False, True])
+@pytest.mark.parametrize("skip_if_empty", [False, "left", "right", "any", "both"])
+def test_vectorized_containment_same_as_per_group(r, r2, invert, skip_if_empty) -> None:
+    res = r.apply_pair(r2, _overlap, by="Id", how="containment", invert=invert, skip_if_empty=skip_if_empty)
+    expected = r.apply_pair(
+        r2,
+        _overlap_per_group,
+        by="Id",
+        how="containment",
+        invert=invert,
+        skip_if_empty=skip_if_empty,
+    )
+    pd.testing.assert_frame_equal(pd.DataFrame(res), pd.DataFrame(expected))
+
+
+@pytest.mark.parametrize("how", ["first", "all", "last"])
+@pytest.mark.parametrize("invert", [False, True])
+@pytest.mark.parametrize("skip_if_empty", [False, "left", "right", "any", "both"])
+def test_vectorized_overlap_without_numba_same_as_per_group(r, r2, how, invert, skip_if_empty, monkeypatch) -> None:
+    monkeypatch.setitem(sys.modules, "pyranges.methods.overlap_numba", None)
+    res = r.apply_pair(r2, _overlap, by="Id", how=how, invert=invert, skip_if_empty=skip_if_empty)
+    expected = r.apply_pair(r2, _overlap_per_group, by="Id", how=how, invert=invert, skip_if_empty=skip_if_empty)
+    pd.testing.assert_frame_equal(pd.DataFrame(res), pd.DataFrame(expected))